@@ -1,28 +1,41 @@
 import streamlit as st
 import math
-import pandas as pd
-import graphviz
+import bisect
+import operator
 from datetime import datetime
+from dataclasses import dataclass
+
+DEFAULT_PARAMS = {
+    'safety_factor': 1.25,
+    'diversity_factor': 0.9,
+    'dc_efficiency': 0.95,
+    'power_factor': 0.95,
+    'ac_voltage': 400,
+    'dc_voltage': 500
+}
 
 # Initialize session state
 def initialize_session_state():
     if 'chargers' not in st.session_state:
-        st.session_state.chargers = []
+        st.session_state.chargers = {}
+        st.session_state.next_id = 0
     if 'design_date' not in st.session_state:
         st.session_state.design_date = datetime.now().strftime("%Y-%m-%d")
     if 'calculation_params' not in st.session_state:
-        st.session_state.calculation_params = {
-            'safety_factor': 1.25,
-            'diversity_factor': 0.9,
-            'dc_efficiency': 0.95,
-            'power_factor': 0.95,
-            'ac_voltage': 400,
-            'dc_voltage': 500
-        }
+        st.session_state.calculation_params = dict(DEFAULT_PARAMS)
+
+SQRT3 = math.sqrt(3)
+INV_SQRT3 = 1.0 / SQRT3
+
+# Charger capacities (kW) offered in the UI
+CHARGER_CAPACITIES = {
+    "AC": (7, 22),
+    "DC": (25, 50, 75, 100, 120, 150, 300, 350)
+}
 
 # Australian Standards Configuration
-STANDARD_BREAKERS = [6, 10, 16, 20, 25, 32, 40, 50, 63, 80, 100, 125, 160, 200, 
-                     250, 315, 400, 500, 630, 800, 1000, 1200, 1600, 2000]
+STANDARD_BREAKERS = (6, 10, 16, 20, 25, 32, 40, 50, 63, 80, 100, 125, 160, 200, 
+                     250, 315, 400, 500, 630, 800, 1000, 1200, 1600, 2000)
 
 # Cable current capacity (AS/NZS 3008:2017)
 CABLE_CAPACITY = {
@@ -39,6 +52,11 @@ CABLE_CAPACITY = {
            50: 99, 70: 125, 95: 152, 120: 178, 150: 207, 185: 240, 240: 287, 
            300: 334, 400: 400, 500: 464, 630: 555}
 }
+# 2D ampacity table: one row per core configuration over a shared size axis
+CABLE_SIZES = tuple(sorted(CABLE_CAPACITY["1C"]))
+CORE_IDX = {cores: i for i, cores in enumerate(CABLE_CAPACITY)}
+CABLE_CAP_TABLE = tuple(tuple(CABLE_CAPACITY[cores][size] for size in CABLE_SIZES)
+                        for cores in CABLE_CAPACITY)
 
 # Common Australian MSB configurations
 MSB_CONFIGS = [
@@ -54,8 +72,62 @@ MSB_CONFIGS = [
     {"Amps": 2500, "Dimensions": "2200x1200x700", "Busbar": 2500},
     {"Amps": 3000, "Dimensions": "2500x1500x800", "Busbar": 3000}
 ]
+MSB_BUSBAR_SORTED = tuple(sorted(m["Busbar"] for m in MSB_CONFIGS))
+MSB_BY_BUSBAR = {m["Busbar"]: m for m in MSB_CONFIGS}
+
+def smallest_at_least(sorted_values, target):
+    # Smallest standard value >= target, or None if target exceeds them all
+    i = bisect.bisect_left(sorted_values, target)
+    return sorted_values[i] if i < len(sorted_values) else None
+
+# Order of the calculation parameters when frozen into a hashable cache key
+PARAM_KEYS = ('safety_factor', 'diversity_factor', 'dc_efficiency',
+              'power_factor', 'ac_voltage', 'dc_voltage')
+
+def params_key(params):
+    return tuple(params[k] for k in PARAM_KEYS)
+
+@dataclass(slots=True, frozen=True)
+class Charger:
+    type: str
+    capacity: int
+    quantity: int
+    voltage: int
+    phase: str
+    full_load_current: float
+    derated_current: float
+    ac_input_current: float
+    derated_ac_current: float
+    breaker_size: int
+    breaker_spec: str
+    cable_size: float
+    cable_type: str
+    cable_capacity: float
+    cable_configuration: str
+
+@st.cache_resource(show_spinner=False)
+def default_results():
+    # Every UI-selectable charger sized under the default params, built once per process
+    key = params_key(DEFAULT_PARAMS)
+    return {(charger_type, capacity): _calc_core(charger_type, capacity, key)
+            for charger_type, capacities in CHARGER_CAPACITIES.items()
+            for capacity in capacities}
 
 def calculate_requirements(charger_type, capacity, quantity, params):
+    # Most users never touch the parameters, so serve those from the precomputed table
+    if params == DEFAULT_PARAMS:
+        defaults = default_results()
+        if (charger_type, capacity) in defaults:
+            result = defaults[(charger_type, capacity)]
+            return dict(result) if result else None
+    # Quantity only scales downstream totals, so it is left out of the cache key.
+    # st.cache_data hands back a fresh copy, so callers are free to mutate it.
+    return _calc_core(charger_type, capacity, params_key(params))
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _calc_core(charger_type, capacity, params_tuple):
+    params = dict(zip(PARAM_KEYS, params_tuple))
+    eff_pf = params['dc_efficiency'] * params['power_factor']
     if charger_type == "AC":
         if capacity == 7:  # Single-phase
             voltage = 230
@@ -66,27 +138,28 @@ def calculate_requirements(charger_type, capacity, quantity, params):
             voltage = params['ac_voltage']
             phase = "Three"
             cores = "4C"
-            current = (capacity * 1000) / (voltage * math.sqrt(3))
+            current = (capacity * 1000) * INV_SQRT3 / voltage
         ac_current = current
     else:  # DC
         voltage = params['dc_voltage']
         phase = "DC"
         cores = "2C"
         current = (capacity * 1000) / voltage
-        ac_power = capacity / (params['dc_efficiency'] * params['power_factor'])
-        ac_current = (ac_power * 1000) / (params['ac_voltage'] * math.sqrt(3))
+        ac_power = capacity / eff_pf
+        ac_current = (ac_power * 1000) * INV_SQRT3 / params['ac_voltage']
 
     derated_current = current * params['safety_factor']
     derated_ac_current = ac_current * params['safety_factor']
     
-    breaker_size = next((b for b in STANDARD_BREAKERS if b >= derated_current), None)
+    breaker_size = smallest_at_least(STANDARD_BREAKERS, derated_current)
     if not breaker_size:
         return None
 
-    cable_size = next((size for size, ampacity in sorted(CABLE_CAPACITY[cores].items()) 
-                     if ampacity >= breaker_size), None)
-    if not cable_size:
+    ampacities = CABLE_CAP_TABLE[CORE_IDX[cores]]
+    idx = bisect.bisect_left(ampacities, breaker_size)
+    if idx == len(CABLE_SIZES):
         return None
+    cable_size = CABLE_SIZES[idx]
 
     if charger_type == "AC":
         if capacity == 7:
@@ -96,39 +169,50 @@ def calculate_requirements(charger_type, capacity, quantity, params):
     else:
         breaker_spec = f"AS/NZS 60947.2, {breaker_size}A, {voltage}V DC"
 
+    # Keys match the Charger fields that follow type, capacity and quantity
     return {
-        "Voltage (V)": voltage,
-        "Phase": phase,
-        "Full Load Current (A)": round(current, 1),
-        "Derated Current (A)": round(derated_current, 1),
-        "AC Input Current (A)": round(ac_current, 1),
-        "Derated AC Current (A)": round(derated_ac_current, 1),
-        "Breaker Size (A)": breaker_size,
-        "Breaker Specs": breaker_spec,
-        "Cable Size (mm²)": cable_size,
-        "Cable Type": f"{cores} PVC/XLPE Cu",
-        "Cable Capacity (A)": CABLE_CAPACITY[cores][cable_size],
-        "Cable Configuration": cores,
-        "Power (kW)": capacity,
-        "Charger Type": charger_type
+        "voltage": voltage,
+        "phase": phase,
+        "full_load_current": round(current, 1),
+        "derated_current": round(derated_current, 1),
+        "ac_input_current": round(ac_current, 1),
+        "derated_ac_current": round(derated_ac_current, 1),
+        "breaker_size": breaker_size,
+        "breaker_spec": breaker_spec,
+        "cable_size": cable_size,
+        "cable_type": f"{cores} PVC/XLPE Cu",
+        "cable_capacity": ampacities[idx],
+        "cable_configuration": cores
     }
 
 def calculate_msb(chargers, params):
-    total_derated_ac_current = sum(
-        charger["Derated AC Current (A)"] * charger["Quantity"] 
-        for charger in chargers
+    # Only these fields feed the MSB sizing, so they are all the cache key needs.
+    # They are kept as parallel columns so the totals below are C-level reductions.
+    chargers = list(chargers)
+    fingerprint = (
+        tuple(c.derated_ac_current for c in chargers),
+        tuple(c.capacity for c in chargers),
+        tuple(c.quantity for c in chargers),
     )
-    total_power = sum(charger["Power (kW)"] * charger["Quantity"] for charger in chargers)
+    return _msb_core(fingerprint, params_key(params))
+
+@st.cache_data(show_spinner=False)
+def _msb_core(chargers_fingerprint, params_tuple):
+    params = dict(zip(PARAM_KEYS, params_tuple))
+    derated_ac_currents, powers, quantities = chargers_fingerprint
+    total_derated_ac_current = sum(map(operator.mul, derated_ac_currents, quantities))
+    total_power = sum(map(operator.mul, powers, quantities))
     
     diversified_current = total_derated_ac_current * params['diversity_factor']
     
-    main_breaker = next((b for b in STANDARD_BREAKERS if b >= diversified_current), None)
+    main_breaker = smallest_at_least(STANDARD_BREAKERS, diversified_current)
     if not main_breaker:
         return None
 
-    msb_config = next((msb for msb in MSB_CONFIGS if msb["Busbar"] >= diversified_current), None)
-    if not msb_config:
+    msb_busbar = smallest_at_least(MSB_BUSBAR_SORTED, diversified_current)
+    if not msb_busbar:
         return None
+    msb_config = MSB_BY_BUSBAR[msb_busbar]
 
     busbar_size = math.ceil(diversified_current / 100) * 100
     
@@ -144,7 +228,52 @@ def calculate_msb(chargers, params):
         "MSB Configuration": f"{msb_config['Amps']}A Main Switchboard"
     }
 
+# Graphviz HTML-like labels for the SLD, formatted per node in generate_sld
+SLD_TRANSFORMER_TMPL = '''<<TABLE BORDER="1" CELLBORDER="0" CELLSPACING="0" CELLPADDING="4">
+        <TR><TD COLSPAN="2" BGCOLOR="#f0f0f0"><B>DISTRIBUTION TRANSFORMER</B></TD></TR>
+        <TR><TD>Rating</TD><TD>{rating}kVA</TD></TR>
+        <TR><TD>Voltage</TD><TD>11kV/415V ±5%</TD></TR>
+        <TR><TD>Impedance</TD><TD>6% (AS/NZS 60076)</TD></TR>
+        <TR><TD>Vector Group</TD><TD>Dyn11</TD></TR>
+    </TABLE>>'''
+
+SLD_EVDB_TMPL = '''<<TABLE BORDER="1" CELLBORDER="0" CELLSPACING="0" CELLPADDING="4">
+        <TR><TD COLSPAN="2" BGCOLOR="#f0f0f0"><B>EV DISTRIBUTION BOARD</B></TD></TR>
+        <TR><TD>Incomer</TD><TD>{incomer}A, 65kA SCCR</TD></TR>
+        <TR><TD>Busbar</TD><TD>{busbar}A, Cu, 1A/mm²</TD></TR>
+        <TR><TD>Protection</TD><TD>Type B RCD (AS/NZS 3000:2018 7.9.2)</TD></TR>
+        <TR><TD>Standard</TD><TD>AS/NZS 3439.1 (Form 4B)</TD></TR>
+    </TABLE>>'''
+
+SLD_BREAKER_TMPL = '''<<TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0">
+            <TR><TD>{type}</TD></TR>
+            <TR><TD>{size}A, 10kA</TD></TR>
+            <TR><TD>{standard}</TD></TR>
+        </TABLE>>'''
+
+SLD_CHARGER_TMPL = '''<<TABLE BORDER="1" CELLBORDER="0" CELLSPACING="0">
+            <TR><TD>EV CHARGER {number}</TD></TR>
+            <TR><TD>{power}kW {charger_type}</TD></TR>
+            <TR><TD>{voltage}V</TD></TR>
+            <TR><TD>AS/NZS 3000:2018 7.9</TD></TR>
+        </TABLE>>'''
+
+SLD_CABLE_INFO_TMPL = '''{size}mm² {cable_type}
+Current Capacity: {capacity}A
+AS/NZS 3008.1.2'''
+
+SLD_LEGEND_LABEL = '''<<TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0" CELLPADDING="4">
+        <TR><TD COLSPAN="2" BGCOLOR="#f0f0f0"><B>LEGEND & STANDARDS</B></TD></TR>
+        <TR><TD>AC Charger</TD><TD BGCOLOR="#c8e6c9">■</TD></TR>
+        <TR><TD>DC Charger</TD><TD BGCOLOR="#bbdefb">■</TD></TR>
+        <TR><TD COLSPAN="2"><I>Design to AS/NZS 3000:2018 Wiring Rules</I></TD></TR>
+        <TR><TD COLSPAN="2"><I>EV Charging: Clause 7.9</I></TD></TR>
+    </TABLE>>'''
+
 def generate_sld(chargers, msb_result, params):
+    # Imported here so sessions that never build an SLD skip loading graphviz
+    import graphviz
+
     # Create the graph
     dot = graphviz.Digraph('EV_Charger_SLD', format='png')
     dot.attr(rankdir='LR', size='12,8', 
@@ -156,23 +285,12 @@ def generate_sld(chargers, msb_result, params):
     trafo_rating = max(math.ceil(total_kva / 100) * 100, 500)  # Minimum 500kVA for EV installations
     
     # 2. Transformer Node
-    trafo_label = f'''<<TABLE BORDER="1" CELLBORDER="0" CELLSPACING="0" CELLPADDING="4">
-        <TR><TD COLSPAN="2" BGCOLOR="#f0f0f0"><B>DISTRIBUTION TRANSFORMER</B></TD></TR>
-        <TR><TD>Rating</TD><TD>{trafo_rating}kVA</TD></TR>
-        <TR><TD>Voltage</TD><TD>11kV/415V ±5%</TD></TR>
-        <TR><TD>Impedance</TD><TD>6% (AS/NZS 60076)</TD></TR>
-        <TR><TD>Vector Group</TD><TD>Dyn11</TD></TR>
-    </TABLE>>'''
+    trafo_label = SLD_TRANSFORMER_TMPL.format(rating=trafo_rating)
     dot.node('TR', trafo_label, shape='plaintext')
     
     # 3. EV Distribution Board (AS/NZS 3439.1 compliant)
-    evdb_label = f'''<<TABLE BORDER="1" CELLBORDER="0" CELLSPACING="0" CELLPADDING="4">
-        <TR><TD COLSPAN="2" BGCOLOR="#f0f0f0"><B>EV DISTRIBUTION BOARD</B></TD></TR>
-        <TR><TD>Incomer</TD><TD>{msb_result["Main Breaker Size (A)"]}A, 65kA SCCR</TD></TR>
-        <TR><TD>Busbar</TD><TD>{msb_result["Busbar Rating (A)"]}A, Cu, 1A/mm²</TD></TR>
-        <TR><TD>Protection</TD><TD>Type B RCD (AS/NZS 3000:2018 7.9.2)</TD></TR>
-        <TR><TD>Standard</TD><TD>AS/NZS 3439.1 (Form 4B)</TD></TR>
-    </TABLE>>'''
+    evdb_label = SLD_EVDB_TMPL.format(incomer=msb_result["Main Breaker Size (A)"],
+                                      busbar=msb_result["Busbar Rating (A)"])
     dot.node('EVDB', evdb_label, shape='plaintext')
     
     # 4. Connection from Transformer to EVDB (AS/NZS 3008 compliant)
@@ -182,60 +300,56 @@ def generate_sld(chargers, msb_result, params):
             fontsize='8')
     
     # 5. Individual charger circuits
+    # DOT statements are written straight into the graph body, bypassing the
+    # per-call attribute quoting of dot.node/dot.edge. Labels come from our own
+    # templates and contain no double quotes, so no escaping is needed.
+    lines = []
     for i, charger in enumerate(chargers):
         breaker_id = f'CB_{i}'
         charger_id = f'CH_{i}'
         
         # Circuit Breaker (AS/NZS 60898 for AC, AS/NZS 60947.2 for DC)
-        breaker_type = 'MCCB' if charger["Breaker Size (A)"] > 100 else 'MCB'
-        breaker_standard = 'AS/NZS 60947.2' if charger["Charger Type"] == 'DC' else 'AS/NZS 60898'
-        breaker_label = f'''<<TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0">
-            <TR><TD>{breaker_type}</TD></TR>
-            <TR><TD>{charger["Breaker Size (A)"]}A, 10kA</TD></TR>
-            <TR><TD>{breaker_standard}</TD></TR>
-        </TABLE>>'''
-        dot.node(breaker_id, breaker_label, shape='none', width='0.75')
+        breaker_type = 'MCCB' if charger.breaker_size > 100 else 'MCB'
+        breaker_standard = 'AS/NZS 60947.2' if charger.type == 'DC' else 'AS/NZS 60898'
+        breaker_label = SLD_BREAKER_TMPL.format(type=breaker_type, size=charger.breaker_size,
+                                                standard=breaker_standard)
+        lines.append(f'\t{breaker_id} [label={breaker_label} shape=none width=0.75]\n')
         
         # Charger
-        charger_color = "#bbdefb" if charger["Charger Type"] == 'DC' else "#c8e6c9"
-        charger_label = f'''<<TABLE BORDER="1" CELLBORDER="0" CELLSPACING="0">
-            <TR><TD>EV CHARGER {i+1}</TD></TR>
-            <TR><TD>{charger["Power (kW)"]}kW {charger["Charger Type"]}</TD></TR>
-            <TR><TD>{charger["Voltage (V)"]}V</TD></TR>
-            <TR><TD>AS/NZS 3000:2018 7.9</TD></TR>
-        </TABLE>>'''
-        dot.node(charger_id, charger_label, shape='box', style='rounded,filled', fillcolor=charger_color)
+        charger_color = "#bbdefb" if charger.type == 'DC' else "#c8e6c9"
+        charger_label = SLD_CHARGER_TMPL.format(number=i+1, power=charger.capacity,
+                                                charger_type=charger.type, voltage=charger.voltage)
+        lines.append(f'\t{charger_id} [label={charger_label} fillcolor="{charger_color}" shape=box style="rounded,filled"]\n')
         
         # Connections (AS/NZS 3008 compliant)
-        dot.edge('EVDB', breaker_id, style='solid', arrowhead='none')
-        cable_info = f'''{charger["Cable Size (mm²)"]}mm² {charger["Cable Type"]}
-Current Capacity: {charger["Cable Capacity (A)"]}A
-AS/NZS 3008.1.2'''
-        dot.edge(breaker_id, charger_id, label=cable_info, fontsize='8')
+        lines.append(f'\tEVDB -> {breaker_id} [arrowhead=none style=solid]\n')
+        cable_info = SLD_CABLE_INFO_TMPL.format(size=charger.cable_size, cable_type=charger.cable_type,
+                                                capacity=charger.cable_capacity)
+        lines.append(f'\t{breaker_id} -> {charger_id} [label="{cable_info}" fontsize=8]\n')
+    dot.body.extend(lines)
     
     # Legend with standards reference
-    legend = '''<<TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0" CELLPADDING="4">
-        <TR><TD COLSPAN="2" BGCOLOR="#f0f0f0"><B>LEGEND & STANDARDS</B></TD></TR>
-        <TR><TD>AC Charger</TD><TD BGCOLOR="#c8e6c9">■</TD></TR>
-        <TR><TD>DC Charger</TD><TD BGCOLOR="#bbdefb">■</TD></TR>
-        <TR><TD COLSPAN="2"><I>Design to AS/NZS 3000:2018 Wiring Rules</I></TD></TR>
-        <TR><TD COLSPAN="2"><I>EV Charging: Clause 7.9</I></TD></TR>
-    </TABLE>>'''
-    dot.node('LEGEND', legend, shape='plaintext', pos='10,10!')
+    dot.node('LEGEND', SLD_LEGEND_LABEL, shape='plaintext', pos='10,10!')
     
-    return dot
+    # Only the DOT text is needed downstream; st.graphviz_chart renders it directly
+    return dot.source
+
+@st.cache_data(show_spinner=False)
+def build_sld_dot_source(chargers, msb_key, params_tuple):
+    params = dict(zip(PARAM_KEYS, params_tuple))
+    return generate_sld(chargers, dict(msb_key), params)
+
+# Incomer cable (4C, mm²) for diversified currents up to each threshold (A)
+INCOMER_THRESHOLDS = (250, 400, 600, 800, math.inf)
+INCOMER_SIZES = (120, 185, 300, 400, 500)
 
 def get_incomer_cable_size(msb_result):
     current = msb_result["Diversified Current (A)"]
-    if current <= 250: return 120
-    elif current <= 400: return 185
-    elif current <= 600: return 300
-    elif current <= 800: return 400
-    else: return 500
+    return INCOMER_SIZES[bisect.bisect_left(INCOMER_THRESHOLDS, current)]
 
-def remove_charger(index):
-    st.session_state.chargers.pop(index)
-    st.rerun()
+def remove_charger(charger_id):
+    # Runs as a button callback, so Streamlit's own rerun picks up the change
+    st.session_state.chargers.pop(charger_id, None)
 
 # Initialize Streamlit App
 initialize_session_state()
@@ -249,23 +363,23 @@ with st.expander("⚙️ Calculation Parameters", expanded=False):
     with col1:
         st.session_state.calculation_params['safety_factor'] = st.number_input(
             "Safety Factor (for continuous loads)", 
-            min_value=1.0, max_value=2.0, value=1.25, step=0.05,
+            min_value=1.0, max_value=2.0, value=DEFAULT_PARAMS['safety_factor'], step=0.05,
             help="AS/NZS 3000 Clause 2.5.7.2 recommends 125% for continuous loads"
         )
         st.session_state.calculation_params['diversity_factor'] = st.number_input(
             "Diversity Factor", 
-            min_value=0.1, max_value=1.0, value=0.9, step=0.05,
+            min_value=0.1, max_value=1.0, value=DEFAULT_PARAMS['diversity_factor'], step=0.05,
             help="Factor applied to total load (AS/NZS 3000 Clause 2.2)"
         )
     with col2:
         st.session_state.calculation_params['dc_efficiency'] = st.number_input(
             "DC Charger Efficiency", 
-            min_value=0.8, max_value=1.0, value=0.95, step=0.01,
+            min_value=0.8, max_value=1.0, value=DEFAULT_PARAMS['dc_efficiency'], step=0.01,
             help="Typical efficiency of DC chargers (92-96%)"
         )
         st.session_state.calculation_params['power_factor'] = st.number_input(
             "Power Factor", 
-            min_value=0.8, max_value=1.0, value=0.95, step=0.01,
+            min_value=0.8, max_value=1.0, value=DEFAULT_PARAMS['power_factor'], step=0.01,
             help="Power factor for AC-DC conversion"
         )
     
@@ -273,13 +387,13 @@ with st.expander("⚙️ Calculation Parameters", expanded=False):
     with col3:
         st.session_state.calculation_params['ac_voltage'] = st.number_input(
             "AC System Voltage (V)", 
-            min_value=100, max_value=500, value=400, step=10,
+            min_value=100, max_value=500, value=DEFAULT_PARAMS['ac_voltage'], step=10,
             help="Three-phase AC system voltage"
         )
     with col4:
         st.session_state.calculation_params['dc_voltage'] = st.number_input(
             "DC Charger Voltage (V)", 
-            min_value=100, max_value=1000, value=500, step=50,
+            min_value=100, max_value=1000, value=DEFAULT_PARAMS['dc_voltage'], step=50,
             help="DC charger output voltage"
         )
 
@@ -289,10 +403,7 @@ with st.expander("➕ Add Chargers", expanded=True):
     with col1:
         charger_type = st.radio("Charger Type", ["AC", "DC"], key="type")
     with col2:
-        if charger_type == "AC":
-            capacity = st.selectbox("Capacity (kW)", [7, 22], key="capacity")
-        else:
-            capacity = st.selectbox("Capacity (kW)", [25, 50, 75, 100, 120, 150, 300, 350], key="capacity")
+        capacity = st.selectbox("Capacity (kW)", CHARGER_CAPACITIES[charger_type], key="capacity")
     with col3:
         quantity = 1
     with col4:
@@ -301,52 +412,60 @@ with st.expander("➕ Add Chargers", expanded=True):
         if st.button("Add Charger", key="add"):
             result = calculate_requirements(charger_type, capacity, quantity, st.session_state.calculation_params)
             if result:
-                st.session_state.chargers.append({
-                    "Type": charger_type,
-                    "Capacity (kW)": capacity,
-                    "Quantity": quantity,
-                    **result
-                })
+                charger_id = st.session_state.next_id
+                st.session_state.next_id += 1
+                st.session_state.chargers[charger_id] = Charger(
+                    type=charger_type, capacity=capacity, quantity=quantity, **result
+                )
                 st.rerun()
             else:
                 st.error("Could not calculate for this configuration. Check parameters.")
 
 if st.session_state.chargers:
     with st.expander("🔌 Configured Chargers", expanded=True):
-        # Create columns for the table header
-        headers = st.columns([1, 1, 1, 1, 1, 1, 1])
-        headers[0].write("**#**")
-        headers[1].write("**Type**")
-        headers[2].write("**Capacity (kW)**")
-        headers[3].write("**Qty**")
-        headers[4].write("**EV Breaker (A)**")
-        headers[5].write("**Cable (mm²)**")
-        headers[6].write("**Actions**")
+        charger_ids = list(st.session_state.chargers)
+        # st.dataframe takes the records as-is, so pandas isn't needed here
+        rows = [{
+            "#": idx + 1,
+            "Type": charger.type,
+            "Capacity (kW)": charger.capacity,
+            "Qty": charger.quantity,
+            "EV Breaker (A)": charger.breaker_size,
+            "Cable (mm²)": charger.cable_size
+        } for idx, charger in enumerate(st.session_state.chargers.values())]
+        st.dataframe(rows, hide_index=True, width="stretch")
         
-        # Display each charger in a row with a remove button
-        for idx, charger in enumerate(st.session_state.chargers):
-            cols = st.columns([1, 1, 1, 1, 1, 1, 1])
-            cols[0].write(str(idx+1))
-            cols[1].write(charger["Type"])
-            cols[2].write(str(charger["Capacity (kW)"]))
-            cols[3].write(str(charger["Quantity"]))
-            cols[4].write(str(charger["Breaker Size (A)"]))
-            cols[5].write(str(charger["Cable Size (mm²)"]))
-            
-            # Add remove button for each charger
-            if cols[6].button("Remove", key=f"remove_{idx}"):
-                st.session_state.chargers.pop(idx)
-                st.rerun()
+        # Single remove control instead of a button per row
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            to_remove = st.selectbox("Remove which?", options=[row["#"] for row in rows], key="remove_choice")
+        with col2:
+            st.write("")
+            st.write("")
+            st.button("Remove", key="remove", on_click=remove_charger,
+                      args=(charger_ids[to_remove - 1],))
         
         # Clear all button
         if st.button("❌ Clear All Chargers", type="primary"):
-            st.session_state.chargers = []
+            st.session_state.chargers = {}
             st.rerun()
 
 # Calculate and Display MSB Requirements
 msb_result = None
 if st.session_state.chargers:
-    msb_result = calculate_msb(st.session_state.chargers, st.session_state.calculation_params)
+    # Reuse the last MSB result and SLD when nothing feeding them has changed,
+    # e.g. on reruns triggered by widgets unrelated to the chargers or params
+    # Chargers are frozen dataclasses, so the tuple of them is itself a hashable key
+    chargers_key = tuple(st.session_state.chargers.values())
+    params_tuple = params_key(st.session_state.calculation_params)
+    inputs_key = (chargers_key, params_tuple)
+    cached = st.session_state.get('cached_outputs')
+    if cached and cached[0] == inputs_key:
+        _, msb_result, sld_source = cached
+    else:
+        msb_result = calculate_msb(chargers_key, st.session_state.calculation_params)
+        sld_source = build_sld_dot_source(chargers_key, tuple(msb_result.items()), params_tuple) if msb_result else None
+        st.session_state.cached_outputs = (inputs_key, msb_result, sld_source)
     
     if msb_result:
         with st.expander("⚡ Main Switchboard (MSB) Requirements", expanded=True):
@@ -365,9 +484,7 @@ if st.session_state.chargers:
 
         # Generate and Display SLD
         with st.expander("📐 Single Line Diagram (SLD)", expanded=True):
-            # sld = generate_sld(st.session_state.chargers, msb_result)
-            sld = generate_sld(st.session_state.chargers, msb_result, st.session_state.calculation_params)
-            st.graphviz_chart(sld, use_container_width=True)
+            st.graphviz_chart(sld_source, width="stretch")
             
             st.caption("**Technical Notes:**")
             st.markdown(f"""